@@ -3,25 +3,43 @@
 import logging
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlmodel import Session
+import numpy as np
+import pandas as pd
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.core.http_cache import (
+    make_etag,
+    not_modified,
+    not_modified_response,
+    set_cache_headers
+)
 from app.db.session import get_session
 from app.schemas.user_rating import (
     BookRecommendationRequest,
     BookRecommendationResponse
 )
-from app.services.recommendation_service import get_book_recommendations
+from app.services.recommendation_service import (
+    get_book_recommendations,
+    get_data_version
+)
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 
+def _column_values(column: pd.Series) -> np.ndarray:
+    """Return a column as an object array with missing values as None."""
+    return column.astype(object).where(column.notna(), None).to_numpy()
+
+
+# Recommendation handlers stay sync: the engine is CPU-bound, so FastAPI
+# runs them in its threadpool instead of blocking the event loop.
 @router.post("/", response_model=List[BookRecommendationResponse])
 def recommend_books(
     request: BookRecommendationRequest,
-    db: Session = Depends(get_session)
+    db: AsyncSession = Depends(get_session)
 ):
     """
     Get book recommendations based on a book title.
@@ -45,19 +63,31 @@ def recommend_books(
                 detail=f"No recommendations found for book: {request.book_title}"
             )
         
-        # Convert DataFrame to response models
-        results = []
-        for _, row in recommendations.iterrows():
-            results.append(
-                BookRecommendationResponse(
-                    isbn=row.get("ISBN", ""),
-                    title=row.get("Book-Title", ""),
-                    author=row.get("Book-Author", ""),
-                    year=str(row.get("Year-Of-Publication", "")) if row.get("Year-Of-Publication") else None,
-                    publisher=row.get("Publisher"),
-                    predicted_rating=float(row.get("Predicted-Rating")) if row.get("Predicted-Rating") else None
-                )
+        # Convert DataFrame to response models: pull each column out once
+        # and zip, instead of boxing every row into a Series
+        years = recommendations["Year-Of-Publication"].astype("string")
+        years = years.mask(years == "0")  # Unknown years are stored as 0
+        predicted = recommendations["Predicted-Rating"]
+        predicted = predicted.mask(predicted == 0)
+        
+        results = [
+            BookRecommendationResponse(
+                isbn=isbn,
+                title=title,
+                author=author,
+                year=year,
+                publisher=publisher,
+                predicted_rating=rating
+            )
+            for isbn, title, author, year, publisher, rating in zip(
+                _column_values(recommendations["ISBN"]),
+                _column_values(recommendations["Book-Title"]),
+                _column_values(recommendations["Book-Author"]),
+                _column_values(years),
+                _column_values(recommendations["Publisher"]),
+                _column_values(predicted)
             )
+        ]
         
         logger.info(f"Generated {len(results)} recommendations for book: {request.book_title}")
         return results
@@ -74,9 +104,11 @@ def recommend_books(
 
 @router.get("/by-title", response_model=List[BookRecommendationResponse])
 def recommend_books_by_title(
+    http_request: Request,
+    response: Response,
     book_title: str = Query(..., min_length=1, description="Book title to base recommendations on"),
     top_n: int = Query(10, ge=1, le=50, description="Number of recommendations to return"),
-    db: Session = Depends(get_session)
+    db: AsyncSession = Depends(get_session)
 ):
     """
     Get book recommendations based on a book title (GET version).
@@ -84,5 +116,20 @@ def recommend_books_by_title(
     This endpoint uses a collaborative filtering recommendation engine
     to suggest similar books based on the provided book title.
     """
+    # Recommendations only change when the data is reloaded, so a repeat
+    # request can be answered from the ETag without recomputing. A
+    # wildcard only matches once the title is known to have results.
+    data_version = get_data_version()
+    etag = None
+    if data_version is not None:
+        etag = make_etag(book_title.lower(), top_n, data_version)
+        if not_modified(http_request, etag, allow_wildcard=False):
+            return not_modified_response(etag)
+    
     request = BookRecommendationRequest(book_title=book_title, top_n=top_n)
-    return recommend_books(request, db)
\ No newline at end of file
+    results = recommend_books(request, db)
+    if etag is not None:
+        if not_modified(http_request, etag):
+            return not_modified_response(etag)
+        set_cache_headers(response, etag)
+    return results
\ No newline at end of file
@@ -1,5 +1,7 @@
 """Authentication utilities."""
 
+import time
+from functools import lru_cache
 from typing import Optional
 from uuid import UUID
 
@@ -12,6 +14,40 @@ from app.core.security import decode_token
 security = HTTPBearer()
 
 
+@lru_cache(maxsize=8192)
+def _decode_user_token(token: str) -> dict:
+    """
+    Decode a token and validate its subject, caching the result.
+    
+    Invalid tokens raise JWTError, so only valid tokens are cached.
+    """
+    payload = decode_token(token)
+    user_id = payload.get("sub")
+    
+    if user_id is None:
+        raise JWTError("Token has no subject")
+    
+    # Validate UUID format
+    try:
+        UUID(user_id)
+    except ValueError:
+        raise JWTError("Token subject is not a valid UUID")
+    
+    return payload
+
+
+def _validate_token(token: str) -> dict:
+    """Return the payload of a valid token, raising JWTError otherwise."""
+    payload = _decode_user_token(token)
+    
+    # Cached payloads skip decode-time checks, so re-check expiry here
+    exp = payload.get("exp")
+    if exp is not None and exp < time.time():
+        raise JWTError("Token has expired")
+    
+    return dict(payload)
+
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security)
 ) -> dict:
@@ -27,21 +63,7 @@ async def get_current_user(
     )
     
     try:
-        token = credentials.credentials
-        payload = decode_token(token)
-        user_id: str = payload.get("sub")
-        
-        if user_id is None:
-            raise credentials_exception
-        
-        # Validate UUID format
-        try:
-            UUID(user_id)
-        except ValueError:
-            raise credentials_exception
-        
-        return payload
-        
+        return _validate_token(credentials.credentials)
     except JWTError:
         raise credentials_exception
 
@@ -56,19 +78,6 @@ async def get_current_user_optional(
         return None
     
     try:
-        token = credentials.credentials
-        payload = decode_token(token)
-        user_id: str = payload.get("sub")
-        
-        if user_id is None:
-            return None
-        
-        try:
-            UUID(user_id)
-        except ValueError:
-            return None
-        
-        return payload
-        
+        return _validate_token(credentials.credentials)
     except JWTError:
-        return None
\ No newline at end of file
+        return None
@@ -0,0 +1,46 @@
+"""HTTP caching utilities (ETag / conditional GET)."""
+
+import hashlib
+from typing import Any
+
+from fastapi import Request, Response, status
+
+CACHE_CONTROL = "public, max-age=30"
+
+
+def make_etag(*parts: Any) -> str:
+    """Build a strong ETag from the given parts."""
+    key = "|".join(str(part) for part in parts).encode()
+    return '"' + hashlib.blake2b(key, digest_size=8).hexdigest() + '"'
+
+
+def set_cache_headers(response: Response, etag: str) -> None:
+    """Attach ETag and Cache-Control headers to a response."""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+
+
+def not_modified(
+    request: Request, etag: str, allow_wildcard: bool = True
+) -> bool:
+    """
+    Check whether the client's If-None-Match already covers this ETag.
+    
+    "*" matches any existing representation; pass allow_wildcard=False
+    while it is not yet known whether one exists.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    
+    tags = {tag.strip() for tag in if_none_match.split(",")}
+    if etag in tags or f"W/{etag}" in tags:
+        return True
+    return allow_wildcard and "*" in tags
+
+
+def not_modified_response(etag: str) -> Response:
+    """Build an empty 304 response carrying the cache headers."""
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    set_cache_headers(response, etag)
+    return response
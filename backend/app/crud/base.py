@@ -1,9 +1,13 @@
 """Base CRUD operations."""
 
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+from typing import (
+    Any, Dict, Generic, List, Optional, Sequence, Tuple, Type, TypeVar, Union
+)
 
 from pydantic import BaseModel
-from sqlmodel import Session, SQLModel, select
+from sqlalchemy import exists, func
+from sqlmodel import SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 ModelType = TypeVar("ModelType", bound=SQLModel)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
@@ -16,33 +20,115 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     def __init__(self, model: Type[ModelType]):
         self.model = model
     
-    def get(self, db: Session, id: Any) -> Optional[ModelType]:
+    async def get(self, db: AsyncSession, id: Any) -> Optional[ModelType]:
         """Get a single record by ID."""
-        return db.get(self.model, id)
+        return await db.get(self.model, id)
     
-    def get_multi(
-        self, db: Session, *, skip: int = 0, limit: int = 100
+    async def exists(self, db: AsyncSession, id: Any) -> bool:
+        """Check whether a record exists without loading it."""
+        statement = select(exists().where(self.model.id == id))
+        return (await db.exec(statement)).one()
+    
+    def _paginate(
+        self,
+        statement,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        after_id: Optional[int] = None
+    ):
+        """
+        Order a statement by id and apply pagination.
+        
+        With after_id, uses keyset pagination (WHERE id > after_id), which
+        stays an index range scan however deep the page. Otherwise falls
+        back to OFFSET/LIMIT.
+        """
+        if after_id is not None:
+            statement = statement.where(self.model.id > after_id)
+        else:
+            statement = statement.offset(skip)
+        return statement.order_by(self.model.id).limit(limit)
+    
+    async def get_multi(
+        self,
+        db: AsyncSession,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        after_id: Optional[int] = None
     ) -> List[ModelType]:
         """Get multiple records."""
-        statement = select(self.model).offset(skip).limit(limit)
-        results = db.exec(statement)
+        statement = self._paginate(
+            select(self.model), skip=skip, limit=limit, after_id=after_id
+        )
+        results = await db.exec(statement)
         return results.all()
     
-    def create(
-        self, db: Session, *, obj_in: CreateSchemaType, **kwargs: Any
+    async def get_page(
+        self,
+        db: AsyncSession,
+        *,
+        filters: Sequence[Any] = (),
+        skip: int = 0,
+        limit: int = 100,
+        after_id: Optional[int] = None
+    ) -> Tuple[List[ModelType], int, Optional[int]]:
+        """
+        Get a page of records matching filters, the total match count, and
+        the after_id of the next page (None on the last page).
+        
+        One extra row is fetched to tell whether a next page exists. Offset
+        pages read the total from COUNT(*) OVER () in the same query. Keyset
+        pages (and offset pages past the end, which return no rows to carry
+        it) need a separate count query.
+        """
+        if after_id is None:
+            statement = self._paginate(
+                select(self.model, func.count().over()).where(*filters),
+                skip=skip,
+                limit=limit + 1
+            )
+            rows = (await db.exec(statement)).all()
+            items = [item for item, _ in rows]
+            total = rows[0][1] if rows else None
+        else:
+            statement = self._paginate(
+                select(self.model).where(*filters),
+                limit=limit + 1,
+                after_id=after_id
+            )
+            items = (await db.exec(statement)).all()
+            total = None
+        
+        next_after_id = items[limit - 1].id if len(items) > limit else None
+        items = items[:limit]
+        
+        if total is None:
+            if after_id is None and skip == 0:
+                total = 0
+            else:
+                count_statement = select(func.count()).select_from(
+                    self.model
+                ).where(*filters)
+                total = (await db.exec(count_statement)).one()
+        return items, total, next_after_id
+    
+    async def create(
+        self, db: AsyncSession, *, obj_in: CreateSchemaType, **kwargs: Any
     ) -> ModelType:
         """Create a new record."""
         obj_data = obj_in.model_dump()
         obj_data.update(kwargs)
         db_obj = self.model(**obj_data)
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        await db.commit()
+        await db.refresh(db_obj)
         return db_obj
     
-    def update(
+    async def update(
         self,
-        db: Session,
+        db: AsyncSession,
         *,
         db_obj: ModelType,
         obj_in: Union[UpdateSchemaType, Dict[str, Any]]
@@ -58,15 +144,15 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
                 setattr(db_obj, field, value)
         
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        await db.commit()
+        await db.refresh(db_obj)
         return db_obj
     
-    def delete(self, db: Session, *, id: Any) -> bool:
+    async def delete(self, db: AsyncSession, *, id: Any) -> bool:
         """Delete a record."""
-        obj = db.get(self.model, id)
+        obj = await db.get(self.model, id)
         if obj:
-            db.delete(obj)
-            db.commit()
+            await db.delete(obj)
+            await db.commit()
             return True
         return False
\ No newline at end of file
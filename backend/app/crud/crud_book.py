@@ -1,9 +1,11 @@
 """CRUD operations for Book."""
 
-from typing import List, Optional
+from typing import Any, List, Optional, Tuple
 from uuid import UUID
 
-from sqlmodel import Session, select, or_
+from sqlalchemy import exists, text
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.crud.base import CRUDBase
 from app.models.book import Book
@@ -13,54 +15,67 @@ from app.schemas.book import BookCreate, BookUpdate
 class CRUDBook(CRUDBase[Book, BookCreate, BookUpdate]):
     """CRUD operations for books."""
     
-    def get_multi_with_filters(
+    def _filters(
         self,
-        db: Session,
         *,
-        skip: int = 0,
-        limit: int = 100,
         search: Optional[str] = None,
-        owner_id: Optional[UUID] = None
-    ) -> List[Book]:
-        """Get books with filters."""
-        statement = select(Book)
+        owner_id: Optional[UUID] = None,
+        include_inactive: bool = False
+    ) -> List[Any]:
+        """Build the WHERE clauses shared by the list and count queries."""
+        filters = []
+        
+        if not include_inactive:
+            # Bare column so the clause matches idx_books_active's predicate
+            filters.append(Book.is_active)
         
         if owner_id is not None:
-            statement = statement.where(Book.owner_id == owner_id)
+            filters.append(Book.owner_id == owner_id)
         
         if search:
-            search_filter = or_(
-                Book.title.ilike(f"%{search}%"),
-                Book.author.ilike(f"%{search}%")
+            # Matches against the GIN-indexed search_tsv column
+            filters.append(
+                text(
+                    "books.search_tsv @@ plainto_tsquery('english', :q)"
+                ).bindparams(q=search)
             )
-            statement = statement.where(search_filter)
         
-        statement = statement.offset(skip).limit(limit)
-        results = db.exec(statement)
-        return results.all()
+        return filters
     
-    def count_with_filters(
+    async def exists(
+        self, db: AsyncSession, id: Any, include_inactive: bool = False
+    ) -> bool:
+        """Check whether a book exists without loading it (active only by default)."""
+        statement = select(
+            exists().where(
+                Book.id == id,
+                *self._filters(include_inactive=include_inactive)
+            )
+        )
+        return (await db.exec(statement)).one()
+    
+    async def get_page_with_filters(
         self,
-        db: Session,
+        db: AsyncSession,
         *,
+        skip: int = 0,
+        limit: int = 100,
         search: Optional[str] = None,
-        owner_id: Optional[UUID] = None
-    ) -> int:
-        """Count books with filters."""
-        statement = select(Book)
-        
-        if owner_id is not None:
-            statement = statement.where(Book.owner_id == owner_id)
-        
-        if search:
-            search_filter = or_(
-                Book.title.ilike(f"%{search}%"),
-                Book.author.ilike(f"%{search}%")
-            )
-            statement = statement.where(search_filter)
-        
-        results = db.exec(statement)
-        return len(results.all())
-
+        owner_id: Optional[UUID] = None,
+        after_id: Optional[int] = None,
+        include_inactive: bool = False
+    ) -> Tuple[List[Book], int, Optional[int]]:
+        """Get a page of books with filters and the total match count."""
+        return await self.get_page(
+            db,
+            filters=self._filters(
+                search=search,
+                owner_id=owner_id,
+                include_inactive=include_inactive
+            ),
+            skip=skip,
+            limit=limit,
+            after_id=after_id
+        )
 
-crud_book = CRUDBook(Book)
\ No newline at end of file
+crud_book = CRUDBook(Book)
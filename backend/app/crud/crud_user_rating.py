@@ -1,9 +1,12 @@
 """CRUD operations for UserRating."""
 
-from typing import List, Optional
+from typing import Any, List, Optional, Tuple
 from uuid import UUID
 
-from sqlmodel import Session, select
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.crud.base import CRUDBase
 from app.models.user_rating import UserRating
@@ -13,74 +16,77 @@ from app.schemas.user_rating import UserRatingCreate, UserRatingUpdate
 class CRUDUserRating(CRUDBase[UserRating, UserRatingCreate, UserRatingUpdate]):
     """CRUD operations for user ratings."""
     
-    def get_by_user_and_book(
-        self,
-        db: Session,
-        *,
-        user_id: UUID,
-        book_id: int
+    async def create(
+        self, db: AsyncSession, *, obj_in: UserRatingCreate, **kwargs: Any
     ) -> Optional[UserRating]:
-        """Get a user's rating for a specific book."""
-        statement = select(UserRating).where(
-            UserRating.user_id == user_id,
-            UserRating.book_id == book_id
+        """
+        Create a rating, or return None if the user already rated the book.
+        
+        Uses INSERT ... ON CONFLICT DO NOTHING so the duplicate check and
+        the insert happen in a single race-free statement.
+        """
+        statement = (
+            insert(UserRating)
+            .values(**obj_in.model_dump(), **kwargs)
+            .on_conflict_do_nothing(index_elements=["user_id", "book_id"])
+            .returning(UserRating)
         )
-        result = db.exec(statement).first()
-        return result
+        rating = (await db.scalars(statement)).first()
+        await db.commit()
+        if rating is not None:
+            await db.refresh(rating)
+        return rating
     
-    def get_user_ratings(
+    async def get_user_ratings_page(
         self,
-        db: Session,
+        db: AsyncSession,
         *,
         user_id: UUID,
         skip: int = 0,
-        limit: int = 100
-    ) -> List[UserRating]:
-        """Get all ratings by a user."""
-        statement = select(UserRating).where(
-            UserRating.user_id == user_id
-        ).offset(skip).limit(limit)
-        results = db.exec(statement)
-        return results.all()
+        limit: int = 100,
+        after_id: Optional[int] = None
+    ) -> Tuple[List[UserRating], int, Optional[int]]:
+        """Get a page of ratings by a user and their total count."""
+        return await self.get_page(
+            db,
+            filters=[UserRating.user_id == user_id],
+            skip=skip,
+            limit=limit,
+            after_id=after_id
+        )
     
-    def get_book_ratings(
+    async def get_book_ratings_page(
         self,
-        db: Session,
+        db: AsyncSession,
         *,
         book_id: int,
         skip: int = 0,
-        limit: int = 100
-    ) -> List[UserRating]:
-        """Get all ratings for a book."""
-        statement = select(UserRating).where(
-            UserRating.book_id == book_id
-        ).offset(skip).limit(limit)
-        results = db.exec(statement)
-        return results.all()
-    
-    def count_user_ratings(
-        self,
-        db: Session,
-        *,
-        user_id: UUID
-    ) -> int:
-        """Count total ratings by a user."""
-        statement = select(UserRating).where(UserRating.user_id == user_id)
-        results = db.exec(statement)
-        return len(results.all())
+        limit: int = 100,
+        after_id: Optional[int] = None
+    ) -> Tuple[List[UserRating], int, Optional[int]]:
+        """Get a page of ratings for a book and their total count."""
+        return await self.get_page(
+            db,
+            filters=[UserRating.book_id == book_id],
+            skip=skip,
+            limit=limit,
+            after_id=after_id
+        )
     
-    def get_average_rating(
+    async def get_average_rating(
         self,
-        db: Session,
+        db: AsyncSession,
         *,
         book_id: int
-    ) -> Optional[float]:
-        """Get average rating for a book."""
-        ratings = self.get_book_ratings(db, book_id=book_id, limit=10000)
-        if not ratings:
+    ) -> Optional[Tuple[float, int]]:
+        """Get average rating and rating count for a book."""
+        statement = select(
+            func.avg(UserRating.rating), func.count()
+        ).where(UserRating.book_id == book_id)
+        avg, count = (await db.exec(statement)).one()
+        if not count:
             return None
-        total = sum(r.rating for r in ratings)
-        return total / len(ratings)
+        return float(avg), count
 
 
 crud_user_rating = CRUDUserRating(UserRating)
\ No newline at end of file
@@ -1,23 +1,131 @@
 """Database session management."""
 
-from sqlmodel import Session, create_engine
+from sqlalchemy import make_url, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 from app.core.config import settings
+from app.models.book import SEARCH_TSV_DDL
 
-# Create database engine
-engine = create_engine(
-    settings.DATABASE_URL,
+# Use the asyncpg driver so queries don't block the event loop, whatever
+# scheme (postgres://, postgresql+psycopg2://, ...) DATABASE_URL is given in
+_url = make_url(settings.DATABASE_URL).set(drivername="postgresql+asyncpg")
+
+# asyncpg has no sslmode keyword; its ssl argument takes the same mode names
+SSL_MODE = _url.query.get("sslmode")
+ASYNC_DATABASE_URL = _url.difference_update_query(["sslmode"])
+
+# Create database engine. The pool is sized per process; when running
+# several Uvicorn workers, put PgBouncer (transaction mode) in front of
+# Postgres so the total connection count stays bounded.
+engine = create_async_engine(
+    ASYNC_DATABASE_URL,
     echo=settings.ENVIRONMENT == "development",
-    pool_pre_ping=True  # Verify connections before using them
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=True,  # Verify connections before using them
+    # Set via connect_args rather than on DATABASE_URL, which the psycopg2
+    # scripts share and libpq would reject
+    connect_args={
+        "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        **({"ssl": SSL_MODE} if SSL_MODE else {}),
+    }
 )
 
 
-def get_session():
+async def get_session():
     """Dependency that provides a database session."""
-    with Session(engine) as session:
+    # expire_on_commit=False: attributes can't be lazily reloaded in async code
+    async with AsyncSession(engine, expire_on_commit=False) as session:
         yield session
 
 
-def init_db():
-    """Initialize database tables."""
+# create_all() only creates missing tables, so changes to existing tables are
+# applied here, in order. Each statement is a no-op once it has been applied.
+UPGRADE_DDL = (
+    # uq_user_book backs the ON CONFLICT rating insert
+    text("""
+        DO $$ BEGIN
+            IF NOT EXISTS (
+                SELECT 1 FROM pg_constraint WHERE conname = 'uq_user_book'
+            ) THEN
+                ALTER TABLE user_ratings
+                    ADD CONSTRAINT uq_user_book UNIQUE (user_id, book_id);
+            END IF;
+        END $$;
+    """),
+    # Timestamps are filled in by Postgres; older tables stored naive UTC
+    # values with no default
+    text("""
+        DO $$
+        DECLARE
+            tbl text;
+            col text;
+        BEGIN
+            FOREACH tbl IN ARRAY ARRAY['books', 'user_ratings'] LOOP
+                FOREACH col IN ARRAY ARRAY['created_at', 'updated_at'] LOOP
+                    IF EXISTS (
+                        SELECT 1 FROM information_schema.columns
+                        WHERE table_schema = current_schema()
+                          AND table_name = tbl AND column_name = col
+                          AND data_type = 'timestamp without time zone'
+                    ) THEN
+                        EXECUTE format(
+                            'ALTER TABLE %I ALTER COLUMN %I TYPE timestamptz '
+                            'USING %I AT TIME ZONE ''UTC''', tbl, col, col
+                        );
+                    END IF;
+                    IF EXISTS (
+                        SELECT 1 FROM information_schema.columns
+                        WHERE table_schema = current_schema()
+                          AND table_name = tbl AND column_name = col
+                          AND column_default IS NULL
+                    ) THEN
+                        EXECUTE format(
+                            'ALTER TABLE %I ALTER COLUMN %I SET DEFAULT now()',
+                            tbl, col
+                        );
+                    END IF;
+                END LOOP;
+            END LOOP;
+        END $$;
+    """),
+    # Full-text search column and its GIN index
+    *(text(statement) for statement in SEARCH_TSV_DDL),
+    # Partial index over active books
+    text(
+        "CREATE INDEX IF NOT EXISTS idx_books_active ON books (id) "
+        "WHERE is_active"
+    ),
+)
+
+# (user_id, book_id) pairs rated more than once, which block uq_user_book
+DUPLICATE_RATINGS = text("""
+    SELECT count(*) FROM (
+        SELECT 1 FROM user_ratings
+        GROUP BY user_id, book_id
+        HAVING count(*) > 1
+    ) AS dup
+    WHERE NOT EXISTS (
+        SELECT 1 FROM pg_constraint WHERE conname = 'uq_user_book'
+    )
+""")
+
+
+async def init_db():
+    """Initialize database tables and upgrade existing ones."""
     from app.db.base import SQLModel
-    SQLModel.metadata.create_all(engine)
\ No newline at end of file
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+        
+        duplicates = (await conn.execute(DUPLICATE_RATINGS)).scalar()
+        if duplicates:
+            raise RuntimeError(
+                f"{duplicates} (user_id, book_id) pairs in user_ratings have "
+                "more than one rating; remove the extra rows before adding "
+                "uq_user_book"
+            )
+        for statement in UPGRADE_DDL:
+            await conn.execute(statement)
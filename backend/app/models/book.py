@@ -4,6 +4,7 @@ from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
+from sqlalchemy import DDL, DateTime, Index, event, func, text
 from sqlmodel import Field, SQLModel
 
 
@@ -11,6 +12,11 @@ class Book(SQLModel, table=True):
     """Book model for database."""
     
     __tablename__ = "books"
+    __table_args__ = (
+        # Partial index over active books only: list queries filter on
+        # is_active and page by id, so this stays small and index-only
+        Index("idx_books_active", "id", postgresql_where=text("is_active")),
+    )
     
     id: Optional[int] = Field(default=None, primary_key=True)
     title: str = Field(max_length=200, index=True)
@@ -24,6 +30,35 @@ class Book(SQLModel, table=True):
     owner_id: Optional[UUID] = Field(default=None, index=True)
     is_active: bool = Field(default=True)
     
-    # Timestamps
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
\ No newline at end of file
+    # Timestamps, generated by the database
+    created_at: Optional[datetime] = Field(
+        default=None,
+        nullable=False,
+        sa_type=DateTime(timezone=True),
+        sa_column_kwargs={"server_default": func.now()}
+    )
+    updated_at: Optional[datetime] = Field(
+        default=None,
+        nullable=False,
+        sa_type=DateTime(timezone=True),
+        sa_column_kwargs={"server_default": func.now(), "onupdate": func.now()}
+    )
+
+
+# Full-text search column: a generated tsvector over title and author.
+# SQLModel has no tsvector type, so the column and its GIN index are
+# added with DDL right after the table is created. init_db() also runs
+# these to upgrade tables created before the column existed.
+SEARCH_TSV_DDL = (
+    "ALTER TABLE books ADD COLUMN IF NOT EXISTS search_tsv tsvector "
+    "GENERATED ALWAYS AS (to_tsvector('english', "
+    "coalesce(title, '') || ' ' || coalesce(author, ''))) STORED",
+    "CREATE INDEX IF NOT EXISTS idx_books_search_tsv "
+    "ON books USING gin (search_tsv)",
+)
+for statement in SEARCH_TSV_DDL:
+    event.listen(
+        Book.__table__,
+        "after_create",
+        DDL(statement).execute_if(dialect="postgresql")
+    )
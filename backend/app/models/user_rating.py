@@ -1,22 +1,48 @@
 """User Rating database model."""
 
 from datetime import datetime
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 from uuid import UUID
 
-from sqlmodel import Field, SQLModel
+from sqlalchemy import DateTime, UniqueConstraint, func
+from sqlmodel import Field, Relationship, SQLModel
+
+if TYPE_CHECKING:
+    from app.models.book import Book
 
 
 class UserRating(SQLModel, table=True):
     """User Rating model for database."""
     
     __tablename__ = "user_ratings"
+    __table_args__ = (
+        # Backed by a composite unique index on (user_id, book_id), which
+        # also serves user_id-only lookups
+        UniqueConstraint("user_id", "book_id", name="uq_user_book"),
+    )
     
     id: Optional[int] = Field(default=None, primary_key=True)
-    user_id: UUID = Field(index=True)
+    user_id: UUID = Field()
     book_id: int = Field(foreign_key="books.id", index=True)
     rating: int = Field(ge=1, le=10)  # Rating scale 1-10
     
-    # Timestamps
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
\ No newline at end of file
+    # Timestamps, generated by the database
+    created_at: Optional[datetime] = Field(
+        default=None,
+        nullable=False,
+        sa_type=DateTime(timezone=True),
+        sa_column_kwargs={"server_default": func.now()}
+    )
+    updated_at: Optional[datetime] = Field(
+        default=None,
+        nullable=False,
+        sa_type=DateTime(timezone=True),
+        sa_column_kwargs={"server_default": func.now(), "onupdate": func.now()}
+    )
+    
+    # Never lazy-loaded: a per-row load would be an N+1 (and fails under
+    # AsyncSession anyway). Queries that need the book must eager-load it
+    # with selectinload(UserRating.book).
+    book: Optional["Book"] = Relationship(
+        sa_relationship_kwargs={"lazy": "raise"}
+    )
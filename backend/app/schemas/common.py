@@ -1,6 +1,6 @@
 """Common Pydantic schemas."""
 
-from typing import Generic, List, TypeVar
+from typing import Generic, List, Optional, TypeVar
 from pydantic import BaseModel, Field
 
 DataT = TypeVar("DataT")
@@ -16,4 +16,6 @@ class PaginatedResponse(BaseModel, Generic[DataT]):
     items: List[DataT]
     total: int
     skip: int
-    limit: int
\ No newline at end of file
+    limit: int
+    # Pass as after_id to fetch the next page; None on the last page
+    next_after_id: Optional[int] = None
\ No newline at end of file
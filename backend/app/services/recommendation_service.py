@@ -2,68 +2,167 @@
 
 import pandas as pd
 import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
+from pyarrow import feather
+from scipy import sparse
+from sklearn.decomposition import TruncatedSVD
+from sklearn.preprocessing import normalize
 import warnings
 import logging
-from typing import Union
+import hashlib
+import os
+import shutil
+import tempfile
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Optional, Tuple, Union
+
+try:
+    import faiss  # Optional: approximate neighbour search for large user bases
+except ImportError:
+    faiss = None
 
 warnings.filterwarnings('ignore')
 logger = logging.getLogger(__name__)
 
-# Global variables to store loaded data
+# Global variables to store loaded data. The array-backed ones are read-only
+# (memory-mapped from the artifact cache and shared between workers), so
+# request handling must copy rather than modify them in place
 _books_data = None
 _ratings_data = None
 _users_data = None
-_user_book_matrix = None
-_user_similarity = None
-_ratings_matrix = None
+_normalized_ratings = None  # Mean-centered, L2-normalized float32 CSR
+_user_vectors = None  # SVD-reduced, L2-normalized user vectors (ANN only)
+_user_ann_index = None  # faiss HNSW index over _user_vectors, if in use
+_ratings_matrix = None  # Sparse int8 CSR (users x ISBNs), 0 = not rated
+_user_index = None  # User-ID for each matrix row
+_isbn_index = None  # ISBN for each matrix column
+_user_to_row = None
+_isbn_to_col = None
 _user_means = None
 _merged_df_filtered = None
+_data_version = None
+_books_searchable = None  # Books that are in the ratings matrix
+_book_titles_lower = None
+_title_index = None
+_title_trigram_index = None  # Trigram -> sorted rows of _books_searchable
+_col_to_book_row = None  # Row of _books_searchable for each matrix column
+
+# Recommendations are computed and cached at this depth, then sliced to
+# the requested top_n (the API caps top_n at 50)
+MAX_CACHED_RECOMMENDATIONS = 50
+
+# Computed artifacts are cached here, one subdirectory per data version;
+# bump CACHE_FORMAT whenever the set of cached files changes
+CACHE_DIR = "data/cache"
+CACHE_FORMAT = 5
+
+# With faiss installed, user bases at least this large find neighbours in an
+# HNSW index over TruncatedSVD-reduced vectors instead of by brute force
+ANN_MIN_USERS = 100000
+ANN_DIMENSIONS = 128
+ANN_EF_SEARCH = 64
 
 
 def load_recommendation_data(
     books_path: str = "data/Books.csv",
     ratings_path: str = "data/Book-Ratings.csv",
     users_path: str = "data/Users.csv",
-    nrows: int = 50000
+    nrows: Optional[int] = 50000,
+    cache_dir: Optional[str] = CACHE_DIR
 ):
     """
     Load and prepare data for the recommendation system.
     
-    This should be called once during application startup.
+    This should be called once during application startup. nrows=None
+    reads the full files. Computed
+    artifacts are cached in cache_dir (None disables caching) and reused
+    while the CSV files and nrows are unchanged.
     """
     global _books_data, _ratings_data, _users_data
-    global _user_book_matrix, _user_similarity, _ratings_matrix
-    global _user_means, _merged_df_filtered
+    global _normalized_ratings, _ratings_matrix
+    global _user_index, _isbn_index, _isbn_to_col
+    global _user_means, _merged_df_filtered, _data_version, _title_index
+    global _user_vectors, _user_ann_index
     
     try:
         logger.info("Loading recommendation data...")
+        _compute_recommendations.cache_clear()
+        _data_version = None
+        _user_vectors = _user_ann_index = None
         
-        # Load datasets
-        _books_data = pd.read_csv(
-            books_path, nrows=nrows, encoding='latin1',
-            sep=';', on_bad_lines='skip'
-        )
-        _ratings_data = pd.read_csv(
-            ratings_path, nrows=nrows, encoding='latin1',
-            sep=';', on_bad_lines='skip'
-        )
-        _users_data = pd.read_csv(
-            users_path, encoding='latin1', nrows=nrows,
-            sep=';', on_bad_lines='skip'
+        data_version = _compute_data_version(
+            (books_path, ratings_path, users_path), nrows
         )
+        if cache_dir is not None and _load_cached_artifacts(cache_dir, data_version):
+            _ratings_data = _users_data = _merged_df_filtered = None
+            _build_lookups()
+            _data_version = data_version
+            logger.info(f"Recommendation data loaded from cache (version {data_version})")
+            return True
+        
+        # Load datasets concurrently (the CSV parsers release the GIL),
+        # reading only the columns that are used
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            books_future = executor.submit(
+                _read_csv, books_path, nrows,
+                usecols=[
+                    "ISBN", "Book-Title", "Book-Author",
+                    "Year-Of-Publication", "Publisher"
+                ],
+                # Authors and publishers repeat heavily; store them once.
+                # Years mix ints and strings in the full dataset, so keep
+                # them as strings (the API serves them as strings anyway)
+                dtype={
+                    "ISBN": "string[pyarrow]",
+                    "Book-Author": "category",
+                    "Year-Of-Publication": "string",
+                    "Publisher": "category"
+                }
+            )
+            ratings_future = executor.submit(
+                _read_csv, ratings_path, nrows,
+                usecols=["User-ID", "ISBN", "Book-Rating"],
+                dtype={
+                    "User-ID": "int32",
+                    "ISBN": "string[pyarrow]",
+                    "Book-Rating": "int8"
+                }
+            )
+            users_future = executor.submit(
+                _read_csv, users_path, nrows,
+                usecols=["User-ID"],
+                dtype={"User-ID": "int32"}
+            )
+            _books_data = books_future.result()
+            _ratings_data = ratings_future.result()
+            _users_data = users_future.result()
         
         logger.info(f"Loaded: {len(_books_data)} books, {len(_ratings_data)} ratings, {len(_users_data)} users")
         
+        # Share one sorted categorical dtype for ISBN so the joins compare
+        # integer codes (and factorize below still orders ISBNs lexically).
+        # Object categories match what the artifact cache reads back
+        isbn_dtype = pd.CategoricalDtype(
+            pd.Index(pd.concat([_books_data["ISBN"], _ratings_data["ISBN"]]))
+            .dropna().unique().sort_values().astype(object).rename(None)
+        )
+        _books_data["ISBN"] = _books_data["ISBN"].astype(isbn_dtype)
+        _ratings_data["ISBN"] = _ratings_data["ISBN"].astype(isbn_dtype)
+        
         # Remove ratings with 0 values
         _ratings_data = _ratings_data[_ratings_data["Book-Rating"] > 0]
         logger.info(f"After removing zero ratings: {len(_ratings_data)} ratings")
         
-        # Merge datasets
-        merged_df = pd.merge(_ratings_data, _books_data, on="ISBN", how="inner")
+        # Join with books and users. Only the rating columns are used
+        # downstream and both keys are unique there, so these are semi-joins
+        # on integer keys (ISBN category codes, int32 User-ID)
+        merged_df = _ratings_data[
+            _ratings_data["ISBN"].cat.codes.isin(_books_data["ISBN"].cat.codes)
+        ]
         logger.info(f"After merging with books: {len(merged_df)} ratings")
         
-        merged_df = pd.merge(merged_df, _users_data, on="User-ID", how="inner")
+        merged_df = merged_df[merged_df["User-ID"].isin(_users_data["User-ID"])]
         logger.info(f"After merging with users: {len(merged_df)} ratings")
         
         if len(merged_df) < 10:
@@ -87,7 +186,9 @@ def load_recommendation_data(
                 merged_df["User-ID"].isin(users_with_enough_ratings)
             ]
             
-            ratings_per_book = _merged_df_filtered.groupby("ISBN")["Book-Rating"].count()
+            ratings_per_book = _merged_df_filtered.groupby(
+                "ISBN", observed=True
+            )["Book-Rating"].count()
             books_with_enough_ratings = ratings_per_book[
                 ratings_per_book >= min_book_ratings
             ].index
@@ -109,48 +210,58 @@ def load_recommendation_data(
             logger.warning("Using unfiltered data...")
             _merged_df_filtered = merged_df
         
-        # Create user-book matrix
-        _user_book_matrix = _merged_df_filtered.pivot_table(
-            index="User-ID",
-            columns="ISBN",
-            values="Book-Rating",
-            fill_value=0
+        # Create the sparse user-book matrix straight from the long-form
+        # ratings. COO -> CSR would sum repeated (user, ISBN) pairs, so keep
+        # one rating per pair (the raw ratings file has no repeats)
+        user_book_ratings = _merged_df_filtered.drop_duplicates(
+            ["User-ID", "ISBN"]
+        )
+        user_codes, user_uniques = pd.factorize(
+            user_book_ratings["User-ID"], sort=True
         )
+        isbn_codes, isbn_uniques = pd.factorize(
+            user_book_ratings["ISBN"], sort=True
+        )
+        _user_index = pd.Index(user_uniques)
+        _isbn_index = pd.Index(np.asarray(isbn_uniques), dtype=object)
         
-        logger.info(f"User-book matrix shape: {_user_book_matrix.shape}")
+        # Ratings are 1-10, so they are stored as int8; all arithmetic on
+        # them is done in float32
+        _ratings_matrix = sparse.coo_matrix(
+            (
+                user_book_ratings["Book-Rating"].to_numpy(dtype=np.int8),
+                (user_codes, isbn_codes)
+            ),
+            shape=(len(_user_index), len(_isbn_index))
+        ).tocsr()
         
-        _ratings_matrix = _user_book_matrix.to_numpy()
+        logger.info(f"User-book matrix shape: {_ratings_matrix.shape}")
         
         # Check if matrix is empty
-        if _ratings_matrix.size == 0 or _ratings_matrix.shape[0] == 0:
+        if _ratings_matrix.nnz == 0 or _ratings_matrix.shape[0] == 0:
             logger.error("Rating matrix is empty")
             return False
         
-        # Normalize ratings
-        _user_means = np.zeros(_ratings_matrix.shape[0])
-        ratings_matrix_normalized = _ratings_matrix.copy()
-        
-        for i in range(_ratings_matrix.shape[0]):
-            user_ratings = _ratings_matrix[i][_ratings_matrix[i] > 0]
-            if len(user_ratings) > 0:
-                _user_means[i] = np.mean(user_ratings)
-                mask = _ratings_matrix[i] > 0
-                ratings_matrix_normalized[i][mask] -= _user_means[i]
-        
-        # Compute user similarity
+        # Normalize ratings; neighbours are searched per request rather
+        # than precomputing all user pairs
         if _ratings_matrix.shape[0] < 2:
             logger.warning("Not enough users for similarity computation")
-            _user_similarity = np.array([[1.0]])
-        else:
-            logger.info("Computing user similarity matrix...")
-            _user_similarity = cosine_similarity(ratings_matrix_normalized)
+        _center_ratings()
+        _freeze(_ratings_matrix, _normalized_ratings)
         
         # Calculate sparsity
-        non_zero_count = np.count_nonzero(_ratings_matrix)
-        sparsity = 1 - (non_zero_count / _ratings_matrix.size)
+        non_zero_count = _ratings_matrix.nnz
+        sparsity = 1 - (
+            non_zero_count / (_ratings_matrix.shape[0] * _ratings_matrix.shape[1])
+        )
         
         logger.info(f"Matrix sparsity: {sparsity:.2%}")
         logger.info(f"Non-zero ratings: {non_zero_count}")
+        
+        _build_lookups()
+        if cache_dir is not None:
+            _save_cached_artifacts(cache_dir, data_version)
+        _data_version = data_version
         logger.info("Recommendation data loaded successfully!")
         
         return True
@@ -162,6 +273,311 @@ def load_recommendation_data(
         return False
 
 
+def _read_csv(
+    path: str,
+    nrows: Optional[int],
+    usecols: list,
+    dtype: dict
+) -> pd.DataFrame:
+    """Read one of the semicolon-separated, latin1 Book-Crossing CSVs."""
+    if nrows is None:
+        # The pyarrow engine parses in parallel but cannot stop after nrows
+        return pd.read_csv(
+            path, engine="pyarrow", usecols=usecols, dtype=dtype,
+            encoding='latin1', sep=';', on_bad_lines='skip'
+        )
+    return pd.read_csv(
+        path, nrows=nrows, usecols=usecols, dtype=dtype,
+        encoding='latin1', sep=';', on_bad_lines='skip'
+    )
+
+
+def _center_ratings() -> None:
+    """Compute user means and the mean-centered, L2-normalized ratings."""
+    global _user_means, _normalized_ratings
+    
+    # Mean-center each user's stored ratings in one pass over the CSR data
+    # (reduceat only over non-empty rows)
+    counts = np.diff(_ratings_matrix.indptr)
+    has_ratings = counts > 0
+    sums = np.zeros(_ratings_matrix.shape[0])
+    sums[has_ratings] = np.add.reduceat(
+        _ratings_matrix.data,
+        _ratings_matrix.indptr[:-1][has_ratings],
+        dtype=np.float64
+    )
+    _user_means = (sums / np.maximum(counts, 1)).astype(np.float32)
+    
+    # Only the values differ from _ratings_matrix, so write them into one
+    # new float32 buffer and share the CSR index arrays instead of copying
+    centered = np.subtract(
+        _ratings_matrix.data, np.repeat(_user_means, counts), dtype=np.float32
+    )
+    _normalized_ratings = sparse.csr_matrix(
+        (centered, _ratings_matrix.indices, _ratings_matrix.indptr),
+        shape=_ratings_matrix.shape,
+        copy=False
+    )
+    
+    # L2-normalize rows (in place) so user similarity is cosine
+    normalize(_normalized_ratings, norm="l2", axis=1, copy=False)
+
+
+def _freeze(*matrices: sparse.csr_matrix) -> None:
+    """Mark the backing arrays read-only, matching the memory-mapped cache."""
+    for matrix in matrices:
+        for array in (matrix.data, matrix.indices, matrix.indptr):
+            array.flags.writeable = False
+
+
+def _build_lookups() -> None:
+    """Build the in-memory lookups and neighbour index for the loaded data."""
+    global _user_vectors, _user_ann_index
+    global _user_to_row, _isbn_to_col
+    global _books_searchable, _book_titles_lower, _title_index
+    global _title_trigram_index, _col_to_book_row
+    
+    if _user_ann_index is None:
+        _user_vectors, _user_ann_index = _build_user_ann_index()
+    
+    _user_to_row = {user_id: i for i, user_id in enumerate(_user_index.tolist())}
+    _isbn_to_col = {isbn: i for i, isbn in enumerate(_isbn_index.tolist())}
+    
+    # Title searches only need books that can actually be recommended
+    _books_searchable = _books_data[
+        _books_data["ISBN"].isin(_isbn_index)
+    ].reset_index(drop=True)
+    _book_titles_lower = _books_searchable["Book-Title"].str.lower()
+    
+    # Every matrix column has exactly one book, so recommendations can be
+    # looked up by position in rank order
+    book_cols = _isbn_index.get_indexer(_books_searchable["ISBN"].astype(object))
+    _col_to_book_row = np.empty(len(_isbn_index), dtype=np.intp)
+    _col_to_book_row[book_cols] = np.arange(len(book_cols))
+    
+    # Map each lowercased title to the position of its first row, so
+    # exact title lookups skip the substring scan
+    titles = _book_titles_lower
+    first_titles = titles.notna() & ~titles.duplicated()
+    _title_index = dict(zip(titles[first_titles], titles.index[first_titles]))
+    
+    # Inverted trigram index for substring search; rows are appended in
+    # order, so every posting list is sorted
+    postings = defaultdict(list)
+    for row, title in enumerate(titles):
+        if isinstance(title, str):
+            for gram in {title[i:i + 3] for i in range(len(title) - 2)}:
+                postings[gram].append(row)
+    _title_trigram_index = {
+        gram: np.array(rows, dtype=np.int32) for gram, rows in postings.items()
+    }
+
+
+def _build_user_ann_index():
+    """Build the HNSW user index when faiss is available and worth it."""
+    n_users, n_books = _normalized_ratings.shape
+    if faiss is None or n_users < ANN_MIN_USERS:
+        return None, None
+    
+    logger.info("Building approximate nearest-neighbour index...")
+    svd = TruncatedSVD(
+        n_components=min(ANN_DIMENSIONS, n_books - 1), random_state=0
+    )
+    user_vectors = np.ascontiguousarray(
+        normalize(svd.fit_transform(_normalized_ratings)), dtype=np.float32
+    )
+    
+    # Inner product of normalized vectors is their cosine similarity
+    index = faiss.IndexHNSWFlat(
+        user_vectors.shape[1], 32, faiss.METRIC_INNER_PRODUCT
+    )
+    index.hnsw.efConstruction = 200
+    index.hnsw.efSearch = ANN_EF_SEARCH
+    index.add(user_vectors)
+    return user_vectors, index
+
+
+def _nearest_users(user_row: int, n: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Return up to n users nearest to a matrix row, most similar first,
+    with their cosine similarity.
+    """
+    query = _normalized_ratings[user_row]
+    if _user_ann_index is None:
+        # Rows are L2-normalized, so one sparse mat-vec gives the cosine
+        # similarity to every user
+        scores = _normalized_ratings @ query.toarray().ravel()
+        rows = _top_indices(scores, n)
+        return rows, scores[rows]
+    
+    _, rows = _user_ann_index.search(_user_vectors[user_row:user_row + 1], n)
+    rows = rows.ravel()
+    rows = rows[rows >= 0]
+    
+    # Re-score the approximate candidates exactly
+    scores = (_normalized_ratings[rows] @ query.T).toarray().ravel()
+    order = np.argsort(-scores, kind="stable")
+    return rows[order], scores[order]
+
+
+def user_loc(user_id: int) -> Optional[int]:
+    """Return the ratings-matrix row for a User-ID, or None if unknown."""
+    return _user_to_row.get(user_id)
+
+
+def isbn_loc(isbn: str) -> Optional[int]:
+    """Return the ratings-matrix column for an ISBN, or None if unknown."""
+    return _isbn_to_col.get(isbn)
+
+
+def _find_title_rows(query: str) -> np.ndarray:
+    """Return the rows of _books_searchable whose lowercased title contains query."""
+    grams = {query[i:i + 3] for i in range(len(query) - 2)}
+    if not grams:
+        # Too short for trigrams; scan the titles
+        return np.flatnonzero(
+            _book_titles_lower.str.contains(query, na=False, regex=False)
+        )
+    
+    # Intersect posting lists, smallest first, then verify the shortlist
+    postings = sorted(
+        (_title_trigram_index.get(gram, np.empty(0, dtype=np.int32)) for gram in grams),
+        key=len
+    )
+    candidates = postings[0]
+    for rows in postings[1:]:
+        if len(candidates) == 0:
+            break
+        candidates = np.intersect1d(candidates, rows, assume_unique=True)
+    
+    titles = _book_titles_lower.to_numpy()
+    return candidates[np.fromiter(
+        (query in titles[row] for row in candidates),
+        dtype=bool,
+        count=len(candidates)
+    )]
+
+
+def _cache_path(cache_dir: str, version: str) -> str:
+    """Return the cache directory for a data version and cache layout."""
+    return os.path.join(cache_dir, f"v{CACHE_FORMAT}-{version}")
+
+
+def _load_cached_artifacts(cache_dir: str, version: str) -> bool:
+    """Load cached artifacts for this data version, if present."""
+    global _books_data, _ratings_matrix, _user_index, _isbn_index
+    global _normalized_ratings, _user_means, _user_vectors, _user_ann_index
+    
+    path = _cache_path(cache_dir, version)
+    if not os.path.isdir(path):
+        return False
+    
+    def load_array(name):
+        # Memory-mapped, so workers share the arrays through the page cache
+        return np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r")
+    
+    try:
+        # Arrow IPC needs no parsing; converting one column per block and
+        # freeing the Arrow buffers as it goes keeps peak memory near one copy
+        books_data = feather.read_table(
+            os.path.join(path, "books.feather"), memory_map=True
+        ).to_pandas(split_blocks=True, self_destruct=True)
+        with np.load(os.path.join(path, "arrays.npz")) as arrays:
+            user_index = pd.Index(arrays["user_index"])
+            isbn_index = pd.Index(arrays["isbn_index"], dtype=object)
+        
+        # Both matrices share one set of index arrays, as when computed
+        shape = (len(user_index), len(isbn_index))
+        indices = load_array("indices")
+        indptr = load_array("indptr")
+        ratings_matrix = sparse.csr_matrix(
+            (load_array("ratings"), indices, indptr), shape=shape, copy=False
+        )
+        normalized_ratings = sparse.csr_matrix(
+            (load_array("normalized"), indices, indptr), shape=shape, copy=False
+        )
+        user_means = load_array("user_means")
+        
+        user_vectors = user_ann_index = None
+        ann_path = os.path.join(path, "users.hnsw")
+        if faiss is not None and os.path.exists(ann_path):
+            user_vectors = load_array("user_vectors")
+            user_ann_index = faiss.read_index(ann_path)
+            user_ann_index.hnsw.efSearch = ANN_EF_SEARCH
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable recommendation cache {path}: {e}")
+        return False
+    
+    _ratings_matrix = ratings_matrix
+    _normalized_ratings = normalized_ratings
+    _user_means = user_means
+    _books_data = books_data
+    _user_index = user_index
+    _isbn_index = isbn_index
+    _user_vectors = user_vectors
+    _user_ann_index = user_ann_index
+    return True
+
+
+def _save_cached_artifacts(cache_dir: str, version: str) -> None:
+    """Cache the computed artifacts; failures only cost the next start."""
+    path = _cache_path(cache_dir, version)
+    if os.path.isdir(path):
+        return
+    
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # Write into a scratch directory and rename it into place, so other
+        # workers never see a partially written cache
+        tmp_path = tempfile.mkdtemp(dir=cache_dir, prefix=".tmp-")
+        try:
+            for name, array in (
+                ("ratings", _ratings_matrix.data),
+                ("normalized", _normalized_ratings.data),
+                ("indices", _ratings_matrix.indices),
+                ("indptr", _ratings_matrix.indptr),
+                ("user_means", _user_means),
+            ):
+                np.save(os.path.join(tmp_path, f"{name}.npy"), array)
+            _books_data.reset_index(drop=True).to_feather(
+                os.path.join(tmp_path, "books.feather")
+            )
+            np.savez(
+                os.path.join(tmp_path, "arrays.npz"),
+                user_index=np.asarray(_user_index),
+                isbn_index=np.asarray(_isbn_index, dtype=str)
+            )
+            if _user_ann_index is not None:
+                np.save(os.path.join(tmp_path, "user_vectors.npy"), _user_vectors)
+                faiss.write_index(
+                    _user_ann_index, os.path.join(tmp_path, "users.hnsw")
+                )
+            os.rename(tmp_path, path)
+        finally:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+        logger.info(f"Cached recommendation artifacts in {path}")
+    except Exception as e:
+        logger.warning(f"Could not cache recommendation artifacts: {e}")
+
+
+def _compute_data_version(paths, nrows) -> str:
+    """Fingerprint the source files so every worker derives the same version."""
+    key = [str(nrows)]
+    for path in paths:
+        stat = os.stat(path)
+        key.append(f"{os.path.abspath(path)}:{stat.st_mtime_ns}:{stat.st_size}")
+    return hashlib.blake2b("|".join(key).encode(), digest_size=8).hexdigest()
+
+
+def get_data_version() -> Optional[str]:
+    """
+    Return a version string for the loaded recommendation data.
+    
+    Changes whenever different data is loaded; None if nothing is loaded.
+    """
+    return _data_version
+
+
 def get_book_recommendations(
     book_title: str,
     k: int = 10,
@@ -170,6 +586,9 @@ def get_book_recommendations(
     """
     Get book recommendations based on a book title using collaborative filtering.
     
+    Results are cached per (case-insensitive) title, so repeated requests
+    for the same book are served without recomputing the predictions.
+    
     Parameters:
     -----------
     book_title : str
@@ -184,14 +603,66 @@ def get_book_recommendations(
     pd.DataFrame or str
         DataFrame with recommended books or error message
     """
-    global _books_data, _user_book_matrix, _user_similarity, _ratings_matrix
-    
     # Check if data is loaded
-    if _user_book_matrix is None or _books_data is None:
+    if _ratings_matrix is None or _books_data is None:
         return "Recommendation system not initialized. Please load data first."
     
     try:
-        # Find books matching the title (case-insensitive partial match)
+        recommendations = _compute_recommendations(
+            book_title.lower(), k, max(top_n, MAX_CACHED_RECOMMENDATIONS)
+        )
+    except Exception as e:
+        logger.error(f"Error generating recommendations: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return f"Error generating recommendations: {str(e)}"
+    
+    if recommendations is None:
+        return f"No books found matching title: '{book_title}'"
+    if isinstance(recommendations, str):
+        return recommendations
+    return recommendations.head(top_n)
+
+
+def _top_indices(scores: np.ndarray, n: int) -> np.ndarray:
+    """Return the indices of the n highest scores, highest first."""
+    n = min(n, len(scores))
+    if n <= 0:
+        return np.empty(0, dtype=np.intp)
+    
+    # Partial selection, then sort only the n candidates
+    candidates = np.argpartition(-scores, n - 1)[:n]
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+@lru_cache(maxsize=10000)
+def _compute_recommendations(
+    book_title: str,
+    k: int,
+    top_n: int
+) -> Optional[Union[pd.DataFrame, str]]:
+    """
+    Compute recommendations for a lowercased book title.
+    
+    Returns None when no book matches, so the caller can report the title
+    as it was requested. Cached; the cache is cleared whenever the data is
+    reloaded. Callers must not modify the returned DataFrame.
+    """
+    global _books_data, _normalized_ratings, _ratings_matrix
+    global _isbn_index, _isbn_to_col, _title_index
+    global _books_searchable, _book_titles_lower, _title_trigram_index
+    
+    # Search only books in the ratings matrix: exact (case-insensitive)
+    # title match first, then the first partial match
+    title_row = _title_index.get(book_title)
+    if title_row is None:
+        matching_rows = _find_title_rows(book_title)
+        if len(matching_rows) > 0:
+            logger.debug("Found %d books matching %r", len(matching_rows), book_title)
+            title_row = matching_rows[0]
+    
+    if title_row is None:
+        # Nothing recommendable matches; scan all books only to explain why
         matching_books = _books_data[
             _books_data["Book-Title"].str.contains(
                 book_title, case=False, na=False, regex=False
@@ -199,100 +670,87 @@ def get_book_recommendations(
         ]
         
         if matching_books.empty:
-            return f"No books found matching title: '{book_title}'"
+            return None
         
-        logger.info(f"Found {len(matching_books)} books matching '{book_title}'")
-        
-        # Get the first matching book's ISBN
-        target_isbn = matching_books.iloc[0]["ISBN"]
         target_title = matching_books.iloc[0]["Book-Title"]
-        
-        logger.info(f"Using book: '{target_title}' (ISBN: {target_isbn})")
-        
-        # Check if this book is in our user-book matrix
-        if target_isbn not in _user_book_matrix.columns:
-            return f"Book '{target_title}' found but not enough ratings for recommendations"
-        
-        # Find users who rated this book
-        book_col_idx = _user_book_matrix.columns.get_loc(target_isbn)
-        users_who_rated = _ratings_matrix[:, book_col_idx] > 0
-        
-        if not np.any(users_who_rated):
-            return f"No users have rated '{target_title}'"
-        
-        logger.info(f"{np.sum(users_who_rated)} users rated this book")
-        
-        # Use the first user who rated this book highly
-        user_ratings = _ratings_matrix[users_who_rated, book_col_idx]
-        best_user_idx = np.where(users_who_rated)[0][np.argmax(user_ratings)]
-        
-        # Adjust k if needed
-        k = min(k, len(_user_book_matrix) - 1)
-        
-        # Get similarity scores
-        similarity_scores = _user_similarity[best_user_idx].copy()
-        similarity_scores[similarity_scores <= 0] = 0
-        
-        # Find k most similar users
-        similar_users_indices = np.argsort(similarity_scores)[::-1][1:k+1]
-        similar_users_indices = similar_users_indices[
-            similarity_scores[similar_users_indices] > 0
-        ]
-        
-        if len(similar_users_indices) == 0:
-            return "No similar users found for recommendations"
-        
-        logger.info(f"Found {len(similar_users_indices)} similar users")
-        
-        # Calculate weighted ratings
-        weights = similarity_scores[similar_users_indices]
-        weights = weights / np.sum(weights)
-        
-        avg_book_ratings = np.zeros(_ratings_matrix.shape[1])
-        for idx, user_idx in enumerate(similar_users_indices):
-            user_ratings = _ratings_matrix[user_idx]
-            avg_book_ratings += user_ratings * weights[idx]
-        
-        # Exclude already rated books
-        user_rated_mask = _ratings_matrix[best_user_idx] > 0
-        avg_book_ratings[user_rated_mask] = -1
-        
-        # Get top recommendations
-        top_book_indices = np.argsort(avg_book_ratings)[::-1]
-        top_book_indices = top_book_indices[
-            avg_book_ratings[top_book_indices] >= 0
-        ][:top_n]
-        
-        if len(top_book_indices) == 0:
-            return "No new books to recommend"
-        
-        recommended_isbns = _user_book_matrix.columns[top_book_indices]
-        
-        # Get book details
-        recommended_books = _books_data[
-            _books_data["ISBN"].isin(recommended_isbns)
-        ][[
-            "ISBN", "Book-Title", "Book-Author",
-            "Year-Of-Publication", "Publisher"
-        ]].copy()
-        
-        # Add predicted ratings
-        predicted_ratings = []
-        for isbn in recommended_books["ISBN"]:
-            col_idx = _user_book_matrix.columns.get_loc(isbn)
-            predicted_ratings.append(avg_book_ratings[col_idx])
-        
-        recommended_books["Predicted-Rating"] = predicted_ratings
-        recommended_books = recommended_books.sort_values(
-            "Predicted-Rating", ascending=False
-        )
-        
-        logger.info(f"Generated {len(recommended_books)} recommendations")
-        
-        return recommended_books
-        
-    except Exception as e:
-        logger.error(f"Error generating recommendations: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        return f"Error generating recommendations: {str(e)}"
\ No newline at end of file
+        return f"Book '{target_title}' found but not enough ratings for recommendations"
+    
+    target_book = _books_searchable.iloc[title_row]
+    target_isbn = target_book["ISBN"]
+    target_title = target_book["Book-Title"]
+    
+    logger.debug("Using book: %r (ISBN: %s)", target_title, target_isbn)
+    
+    book_col_idx = isbn_loc(target_isbn)
+    
+    # Find users who rated this book
+    book_ratings = _ratings_matrix[:, book_col_idx].toarray().ravel()
+    users_who_rated = book_ratings > 0
+    
+    if not np.any(users_who_rated):
+        return f"No users have rated '{target_title}'"
+    
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("%d users rated this book", np.count_nonzero(users_who_rated))
+    
+    # Use the first user who rated this book highly
+    user_ratings = book_ratings[users_who_rated]
+    best_user_idx = np.where(users_who_rated)[0][np.argmax(user_ratings)]
+    
+    # Adjust k if needed
+    k = min(k, _ratings_matrix.shape[0] - 1)
+    
+    # Find k most similar users; ask for one extra neighbour since the
+    # user is normally their own nearest
+    neighbors, similarity_scores = _nearest_users(best_user_idx, k + 1)
+    
+    others = neighbors != best_user_idx  # Exclude the user itself
+    similar_users_indices = neighbors[others][:k]
+    similarity_scores = similarity_scores[others][:k]
+    
+    positive = similarity_scores > 0
+    similar_users_indices = similar_users_indices[positive]
+    
+    if len(similar_users_indices) == 0:
+        return "No similar users found for recommendations"
+    
+    logger.debug("Found %d similar users", len(similar_users_indices))
+    
+    # Calculate weighted ratings
+    weights = similarity_scores[positive]
+    weights = weights / np.sum(weights)
+    
+    # One sparse mat-vec over the similar users' rows
+    avg_book_ratings = np.asarray(
+        weights @ _ratings_matrix[similar_users_indices]
+    ).ravel()
+    
+    # Exclude already rated books
+    avg_book_ratings[_ratings_matrix[best_user_idx].indices] = -1
+    
+    # Get top recommendations
+    top_book_indices = _top_indices(avg_book_ratings, top_n)
+    top_book_indices = top_book_indices[
+        avg_book_ratings[top_book_indices] >= 0
+    ]
+    
+    if len(top_book_indices) == 0:
+        return "No new books to recommend"
+    
+    # Get book details, already in rank order
+    recommended_books = _books_searchable.iloc[
+        _col_to_book_row[top_book_indices]
+    ][[
+        "ISBN", "Book-Title", "Book-Author",
+        "Year-Of-Publication", "Publisher"
+    ]].reset_index(drop=True)
+    
+    # Add predicted ratings
+    recommended_books["Predicted-Rating"] = avg_book_ratings[top_book_indices]
+    
+    logger.info(
+        "Generated %d recommendations for %r (ISBN: %s)",
+        len(recommended_books), target_title, target_isbn
+    )
+    
+    return recommended_books
@@ -1,9 +1,22 @@
 """Initialize database tables."""
 
-from app.db.session import engine
-from app.db.base import SQLModel
+import asyncio
+import sys
+
+from app.db.session import engine, init_db
 
 if __name__ == "__main__":
     print("Creating database tables...")
-    SQLModel.metadata.create_all(engine)
-    print("✓ Database initialized successfully!")
\ No newline at end of file
+    
+    async def main():
+        try:
+            await init_db()
+        finally:
+            await engine.dispose()
+    
+    try:
+        asyncio.run(main())
+    except RuntimeError as e:
+        print(f"✗ {e}")
+        sys.exit(1)
+    print("✓ Database initialized successfully!")
@@ -3,21 +3,66 @@ Comprehensive Database and Application Test
 Tests connection, tables, and API endpoints
 """
 
+import asyncio
+import csv
+import functools
+import io
 import sys
+from collections import defaultdict
 from pathlib import Path
 
-# Add project root to path
-project_root = Path(__file__).parent
-sys.path.insert(0, str(project_root))
-
 from dotenv import load_dotenv
-from sqlalchemy import create_engine, text, inspect
+
+
+@functools.cache
+def _bootstrap():
+    """Put the project root on sys.path and load .env, once per process."""
+    project_root = str(Path(__file__).parent)
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
+    load_dotenv()
+
+
+_bootstrap()
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
 from sqlalchemy.exc import OperationalError
 from app.core.config import settings
-import socket
 
-# Load environment variables
-load_dotenv()
+# SQL statements, built once so every execution reuses the same construct
+# (and SQLAlchemy's compiled statement cache)
+SERVER_INFO_SQL = text("SELECT version(), current_database(), current_user;")
+COLUMNS_SQL = text("""
+    SELECT c.table_name, c.column_name, c.data_type, c.is_nullable
+    FROM information_schema.columns c
+    JOIN information_schema.tables t
+      ON t.table_schema = c.table_schema AND t.table_name = c.table_name
+    WHERE c.table_schema = 'public' AND t.table_type = 'BASE TABLE'
+    ORDER BY c.table_name, c.ordinal_position;
+""")
+INSERT_BOOK_SQL = text("""
+    INSERT INTO books (title, author, isbn, description, published_year, pages, is_active, created_at, updated_at)
+    VALUES (:title, :author, :isbn, :description, :published_year, :pages, true, NOW(), NOW())
+    RETURNING id, title;
+""")
+SELECT_BOOK_SQL = text("SELECT id, title FROM books WHERE id = :id;")
+UPDATE_BOOK_SQL = text("""
+    UPDATE books 
+    SET description = :description 
+    WHERE id = :id;
+""")
+DELETE_BOOK_SQL = text("DELETE FROM books WHERE id = :id;")
+BATCH_INSERT_BOOK_SQL = text("""
+    INSERT INTO books (title, author, isbn, published_year, pages, is_active)
+    VALUES (:title, :author, :isbn, :published_year, :pages, true);
+""")
+DELETE_BOOKS_BY_ISBN_SQL = text("DELETE FROM books WHERE isbn = :isbn;")
+# Planner estimate from the catalog; -1 until the table has been analyzed
+ESTIMATE_RATINGS_SQL = text(
+    "SELECT reltuples::BIGINT FROM pg_class WHERE oid = 'user_ratings'::regclass;"
+)
+COUNT_RATINGS_SQL = text("SELECT COUNT(*) FROM user_ratings;")
 
 print("=" * 80)
 print("COMPREHENSIVE SETUP TEST")
@@ -31,73 +76,85 @@ print(f"Environment: {settings.ENVIRONMENT}")
 print()
 
 # Parse URL
-if DATABASE_URL.startswith("postgresql://"):
-    parts = DATABASE_URL.replace("postgresql://", "").split("@")
-    user_pass = parts[0].split(":")
-    host_db = parts[1].split("/")
-    host_port = host_db[0].split(":")
-    
-    user = user_pass[0]
-    password = user_pass[1] if len(user_pass) > 1 else ""
-    host = host_port[0]
-    port = host_port[1] if len(host_port) > 1 else "5432"
-    database = host_db[1].split("?")[0] if len(host_db) > 1 else ""
-else:
+url = make_url(DATABASE_URL)
+if url.get_backend_name() != "postgresql":
     print("✗ Not a PostgreSQL URL")
     sys.exit(1)
 
+user = url.username
+host = url.host or "localhost"
+port = url.port or 5432
+database = url.database or ""
+
 all_tests_passed = True
 
-# TEST 1: Network connectivity
-print("-" * 80)
-print("TEST 1: Network Connectivity")
-print("-" * 80)
+# Pool configured like the application's; the probes below each take a
+# pooled connection, and the CRUD test reuses one of them
+engine = create_engine(
+    DATABASE_URL,
+    echo=False,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=True,
+    # Send executemany() parameter sets in pages rather than one by one
+    executemany_mode="values_plus_batch",
+    # Tag the sessions so pg_stat_activity and the server logs attribute
+    # these queries to this script, and keep a stuck probe from hanging it
+    connect_args={
+        "options": "-c application_name=bookyard_test_connection "
+                   "-c statement_timeout=5000"
+    }
+)
 
-try:
-    # Resolve localhost to IP if needed
-    if host == "localhost":
-        test_host = "127.0.0.1"
-    else:
-        test_host = host
-    
-    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    sock.settimeout(3)
-    result = sock.connect_ex((test_host, int(port)))
-    sock.close()
-    
-    if result == 0:
-        print(f"✓ Port {port} is accessible on {host}")
-    else:
-        print(f"✗ Port {port} is NOT accessible on {host}")
-        print("\nPostgreSQL is not running. Start it first!")
-        all_tests_passed = False
-except Exception as e:
-    print(f"✗ Network test failed: {e}")
-    all_tests_passed = False
 
-print()
+def fetch_server_info():
+    """Return (version, database, user) of the server."""
+    with engine.connect() as conn:
+        return conn.execute(SERVER_INFO_SQL).fetchone()
+
 
-# TEST 2: Database connection
+def fetch_tables():
+    """Return the public table names and their columns grouped by table."""
+    with engine.connect() as conn:
+        # Tables and columns together in one catalog query
+        columns_by_table = defaultdict(list)
+        for row in conn.execute(COLUMNS_SQL):
+            columns_by_table[row.table_name].append(row)
+        return list(columns_by_table), columns_by_table
+
+
+def fetch_ratings_count():
+    """Return the user_ratings row count, estimated when possible."""
+    with engine.connect() as conn:
+        # The estimate avoids a full scan; count exactly only if the
+        # table has never been analyzed
+        count = conn.execute(ESTIMATE_RATINGS_SQL).scalar()
+        if count < 0:
+            return conn.execute(COUNT_RATINGS_SQL).scalar()
+        return f"~{count} (estimated)"
+
+
+async def run_probes():
+    """Run the read-only probes concurrently, one pooled connection each."""
+    return await asyncio.gather(
+        asyncio.to_thread(fetch_server_info),
+        asyncio.to_thread(fetch_tables),
+        asyncio.to_thread(fetch_ratings_count),
+        return_exceptions=True
+    )
+
+
+server_info, table_info, ratings_count = asyncio.run(run_probes())
+
+# TEST 1: Database connection
 print("-" * 80)
-print("TEST 2: Database Connection")
+print("TEST 1: Database Connection")
 print("-" * 80)
 
-try:
-    engine = create_engine(DATABASE_URL, echo=False)
-    
-    with engine.connect() as conn:
-        result = conn.execute(text("SELECT version();"))
-        version = result.fetchone()[0]
-        
-        result = conn.execute(text("SELECT current_database(), current_user;"))
-        db_info = result.fetchone()
-        
-        print(f"✓ Connection successful")
-        print(f"✓ Database: {db_info[0]}")
-        print(f"✓ User: {db_info[1]}")
-        print(f"✓ PostgreSQL version: {version[:60]}...")
-        
-except OperationalError as e:
+if isinstance(server_info, OperationalError):
+    e = server_info
     print(f"✗ Connection failed: {e}")
     all_tests_passed = False
     
@@ -106,20 +163,33 @@ except OperationalError as e:
         print(f"  createdb -U {user} {database}")
     elif "password authentication failed" in str(e):
         print("\nPassword authentication failed. Check .env credentials")
+    elif "Connection refused" in str(e) or "No such file or directory" in str(e):
+        print(f"\nNothing is accepting connections on {host}:{port}.")
+        print("PostgreSQL is not running. Start it first!")
     
     print()
     sys.exit(1)
+elif isinstance(server_info, Exception):
+    raise server_info
+
+version, db_name, db_user = server_info
+print(f"✓ Connection successful")
+print(f"✓ Database: {db_name}")
+print(f"✓ User: {db_user}")
+print(f"✓ PostgreSQL version: {version[:60]}...")
 
 print()
 
-# TEST 3: Check tables
+# TEST 2: Check tables
 print("-" * 80)
-print("TEST 3: Database Tables")
+print("TEST 2: Database Tables")
 print("-" * 80)
 
+tables = []
 try:
-    inspector = inspect(engine)
-    tables = inspector.get_table_names()
+    if isinstance(table_info, Exception):
+        raise table_info
+    tables, columns_by_table = table_info
     
     expected_tables = ["books", "user_ratings"]
     
@@ -132,13 +202,12 @@ try:
         print(f"✓ Found {len(tables)} table(s):")
         
         for table in tables:
-            columns = inspector.get_columns(table)
+            columns = columns_by_table[table]
             print(f"\n  Table: {table}")
             print(f"  Columns: {len(columns)}")
             for col in columns:
-                col_type = str(col['type'])
-                nullable = "NULL" if col['nullable'] else "NOT NULL"
-                print(f"    - {col['name']}: {col_type} ({nullable})")
+                nullable = "NULL" if col.is_nullable == "YES" else "NOT NULL"
+                print(f"    - {col.column_name}: {col.data_type} ({nullable})")
         
         # Check for expected tables
         print("\n  Expected tables:")
@@ -155,46 +224,99 @@ except Exception as e:
 
 print()
 
-# TEST 4: Test CRUD operations
+# TEST 3: Test CRUD operations
 print("-" * 80)
-print("TEST 4: CRUD Operations Test")
+print("TEST 3: CRUD Operations Test")
 print("-" * 80)
 
 if "books" in tables:
     try:
-        with engine.connect() as conn:
+        # One transaction for the whole round trip; commits on exit
+        with engine.begin() as conn:
             # Test INSERT
-            result = conn.execute(text("""
-                INSERT INTO books (title, author, isbn, description, published_year, pages, is_active, created_at, updated_at)
-                VALUES ('Test Book', 'Test Author', '1234567890', 'Test Description', 2024, 300, true, NOW(), NOW())
-                RETURNING id, title;
-            """))
-            conn.commit()
+            result = conn.execute(
+                INSERT_BOOK_SQL,
+                {
+                    "title": "Test Book",
+                    "author": "Test Author",
+                    "isbn": "1234567890",
+                    "description": "Test Description",
+                    "published_year": 2024,
+                    "pages": 300,
+                }
+            )
             
             inserted = result.fetchone()
             test_id = inserted[0]
             print(f"✓ INSERT: Created book with ID {test_id}")
             
             # Test SELECT
-            result = conn.execute(text(f"SELECT * FROM books WHERE id = {test_id};"))
+            result = conn.execute(SELECT_BOOK_SQL, {"id": test_id})
             book = result.fetchone()
-            print(f"✓ SELECT: Retrieved book '{book[1]}'")
+            print(f"✓ SELECT: Retrieved book '{book.title}'")
             
             # Test UPDATE
-            conn.execute(text(f"""
-                UPDATE books 
-                SET description = 'Updated Description' 
-                WHERE id = {test_id};
-            """))
-            conn.commit()
+            conn.execute(
+                UPDATE_BOOK_SQL,
+                {"description": "Updated Description", "id": test_id}
+            )
             print(f"✓ UPDATE: Updated book description")
             
             # Test DELETE
-            conn.execute(text(f"DELETE FROM books WHERE id = {test_id};"))
-            conn.commit()
+            conn.execute(DELETE_BOOK_SQL, {"id": test_id})
             print(f"✓ DELETE: Deleted test book")
             
+            # Test batch INSERT: one executemany call for all rows
+            batch_rows = [
+                {
+                    "title": f"Batch Test Book {i}",
+                    "author": "Test Author",
+                    "isbn": "BATCHTEST",
+                    "published_year": 2024,
+                    "pages": 300,
+                }
+                for i in range(1000)
+            ]
+            conn.execute(BATCH_INSERT_BOOK_SQL, batch_rows)
+            batched = conn.execute(
+                DELETE_BOOKS_BY_ISBN_SQL, {"isbn": "BATCHTEST"}
+            ).rowcount
+            
+            # Test bulk load: stream rows through COPY FROM STDIN on the
+            # same connection and transaction
+            copy_rows = [
+                (f"Copy Test Book {i}", "Test Author", "COPYTEST", 2024, 300, "true")
+                for i in range(5)
+            ]
+            csv_buf = io.StringIO()
+            csv.writer(csv_buf).writerows(copy_rows)
+            csv_buf.seek(0)
+            
+            with conn.connection.cursor() as cursor:
+                cursor.copy_expert(
+                    "COPY books (title, author, isbn, published_year, pages, is_active) "
+                    "FROM STDIN WITH CSV",
+                    csv_buf
+                )
+            copied = conn.execute(
+                DELETE_BOOKS_BY_ISBN_SQL, {"isbn": "COPYTEST"}
+            ).rowcount
+        
+        bulk_ok = True
+        for label, expected, found in (
+            ("Batch INSERT", len(batch_rows), batched),
+            ("COPY", len(copy_rows), copied),
+        ):
+            if found == expected:
+                print(f"✓ {label}: Loaded and removed {found} test books")
+            else:
+                print(f"✗ {label}: Expected {expected} rows, found {found}")
+                bulk_ok = False
+        
+        if bulk_ok:
             print("\n✓ All CRUD operations working!")
+        else:
+            all_tests_passed = False
             
     except Exception as e:
         print(f"✗ CRUD test failed: {e}")
@@ -205,18 +327,17 @@ else:
 
 print()
 
-# TEST 5: Test user_ratings table (if exists)
+# TEST 4: Test user_ratings table (if exists)
 print("-" * 80)
-print("TEST 5: User Ratings Table Test")
+print("TEST 4: User Ratings Table Test")
 print("-" * 80)
 
 if "user_ratings" in tables:
     try:
-        with engine.connect() as conn:
-            result = conn.execute(text("SELECT COUNT(*) FROM user_ratings;"))
-            count = result.fetchone()[0]
-            print(f"✓ user_ratings table accessible")
-            print(f"✓ Current ratings count: {count}")
+        if isinstance(ratings_count, Exception):
+            raise ratings_count
+        print(f"✓ user_ratings table accessible")
+        print(f"✓ Current ratings count: {ratings_count}")
     except Exception as e:
         print(f"✗ user_ratings test failed: {e}")
         all_tests_passed = False
@@ -225,6 +346,8 @@ else:
     print("  Run: python init_db.py")
     all_tests_passed = False
 
+engine.dispose()
+
 print()
 
 # SUMMARY